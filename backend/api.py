@@ -7,6 +7,8 @@ from rag_engine import HealthcareRAG
 from evaluator import RAGEvaluator
 from pdf_processor import PDFProcessor
 import os
+import gzip
+import uuid
 from datetime import datetime
 
 app = Flask(__name__, static_folder='../frontend', static_url_path='')
@@ -23,9 +25,77 @@ app_state = {
     'current_data': [],
     'data_source': 'none',
     'documents': [],  # List of uploaded documents
-    'selected_docs': []  # Documents to query
+    'selected_docs': [],  # Documents to query
+    'documents_version': 0  # Bumped whenever documents or selection change
 }
 
+# Distinguishes ETags issued before a restart from ones issued by this process
+INSTANCE_ID = uuid.uuid4().hex
+
+def mark_documents_changed():
+    app_state['documents_version'] += 1
+
+def documents_version():
+    return INSTANCE_ID + '-' + str(app_state['documents_version'])
+
+def document_summary(doc):
+    # Page text stays server-side; fetch it via /api/documents/<doc_id>/pages
+    return {
+        'id': doc['id'],
+        'name': doc['name'],
+        'type': doc['type'],
+        'pages': doc['pages'],
+        'uploaded_at': doc['uploaded_at']
+    }
+
+def get_pagination_args(default_limit, max_limit):
+    # Raises ValueError for non-integer offset/limit so callers can return a 400
+    values = {}
+    for name, default in (('offset', 0), ('limit', default_limit)):
+        raw = request.args.get(name, default)
+        try:
+            values[name] = int(raw)
+        except (TypeError, ValueError):
+            raise ValueError('Invalid ' + name + ': ' + str(raw))
+    offset = max(values['offset'], 0)
+    limit = min(max(values['limit'], 1), max_limit)
+    return offset, limit
+
+def paginate(items, offset, limit):
+    page = items[offset:offset + limit]
+    next_offset = offset + limit if offset + limit < len(items) else None
+    return page, {
+        'offset': offset,
+        'limit': limit,
+        'total': len(items),
+        'has_more': next_offset is not None,
+        'next_offset': next_offset
+    }
+
+@app.after_request
+def compress_response(response):
+    if response.direct_passthrough:
+        return response
+    if response.mimetype != 'application/json' and response.status_code != 304:
+        return response
+    
+    # Any JSON response (or 304 revalidation of one) may vary by encoding
+    response.vary.add('Accept-Encoding')
+    
+    if (request.accept_encodings['gzip'] <= 0
+            or response.status_code < 200 or response.status_code >= 300
+            or 'Content-Encoding' in response.headers
+            or response.mimetype != 'application/json'):
+        return response
+    
+    body = response.get_data()
+    if len(body) < Config.COMPRESS_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(body, compresslevel=Config.COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
 @app.route('/')
 def index():
     return send_from_directory('../frontend', 'index.html')
@@ -65,22 +135,75 @@ def load_sample_data():
         app_state['current_data'] = data
         app_state['data_source'] = 'sample'
         app_state['selected_docs'] = [doc['id'] for doc in app_state['documents']]
+        mark_documents_changed()
         
         return jsonify({
             'success': True,
             'message': 'Loaded ' + str(len(data)) + ' samples',
-            'documents': app_state['documents']
+            'num_documents': len(app_state['documents'])
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/documents', methods=['GET'])
 def get_documents():
-    return jsonify({
+    try:
+        offset, limit = get_pagination_args(Config.DOCUMENTS_PAGE_SIZE, Config.DOCUMENTS_MAX_PAGE_SIZE)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    version = documents_version()
+    etag = 'docs-%s-%d-%d' % (version, offset, limit)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    
+    page, pagination = paginate(app_state['documents'], offset, limit)
+    response = jsonify({
         'success': True,
-        'documents': app_state['documents'],
-        'selected_docs': app_state['selected_docs']
+        'documents': [document_summary(doc) for doc in page],
+        'selected_docs': app_state['selected_docs'],
+        'pagination': pagination,
+        'version': version
     })
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/documents/<doc_id>/pages', methods=['GET'])
+def get_document_pages(doc_id):
+    doc = next((d for d in app_state['documents'] if d['id'] == doc_id), None)
+    if doc is None:
+        return jsonify({'success': False, 'error': 'Document not found'}), 404
+    
+    try:
+        offset, limit = get_pagination_args(Config.PAGE_TEXT_PAGE_SIZE, Config.PAGE_TEXT_MAX_PAGE_SIZE)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    # Document contents never change after upload, so id + upload time is enough
+    etag = 'pages-%s-%s-%s-%d-%d' % (INSTANCE_ID, doc['id'], doc['uploaded_at'], offset, limit)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    
+    pages, pagination = paginate(doc['data'], offset, limit)
+    response = jsonify({
+        'success': True,
+        'document': document_summary(doc),
+        'pages': [{
+            'pmcid': item.get('pmcid'),
+            'title': item.get('title'),
+            'page_num': item.get('page_num', 1),
+            'text': item.get('full_text', '')
+        } for item in pages],
+        'pagination': pagination
+    })
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/api/documents/select', methods=['POST'])
 def select_documents():
@@ -99,6 +222,7 @@ def select_documents():
         for doc in app_state['documents']:
             if doc['id'] in doc_ids:
                 app_state['current_data'].extend(doc['data'])
+        mark_documents_changed()
         
         return jsonify({
             'success': True,
@@ -130,11 +254,12 @@ def delete_document():
         # Mark index as not built since data changed
         if len(app_state['documents']) == 0:
             app_state['index_built'] = False
+        mark_documents_changed()
         
         return jsonify({
             'success': True,
             'message': 'Document deleted',
-            'documents': app_state['documents']
+            'num_documents': len(app_state['documents'])
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -197,6 +322,7 @@ def upload_pdf():
         
         # Mark index as not built since new data was added
         app_state['index_built'] = False
+        mark_documents_changed()
         
         pdf_info = {
             'filename': filename,
@@ -210,7 +336,7 @@ def upload_pdf():
         return jsonify({
             'success': True,
             'message': 'Successfully processed ' + filename,
-            'documents': app_state['documents'],
+            'num_documents': len(app_state['documents']),
             'pdf_info': pdf_info
         })
         
@@ -11,6 +11,12 @@ class Config:
     LLM_TEMPERATURE = 0.1
     TOP_K = 3
     SIMILARITY_THRESHOLD = 0.7
+    DOCUMENTS_PAGE_SIZE = 50
+    DOCUMENTS_MAX_PAGE_SIZE = 200
+    PAGE_TEXT_PAGE_SIZE = 5
+    PAGE_TEXT_MAX_PAGE_SIZE = 20
+    COMPRESS_MIN_SIZE = 500
+    COMPRESS_LEVEL = 6
     
     @classmethod
     def validate(cls):